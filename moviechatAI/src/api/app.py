@@ -1,85 +1,233 @@
-import logging
-from pathlib import Path
-from typing import Literal, Optional
-
-from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field
-
-load_dotenv()
-
-from src.core.recommender import recommend_ai
-
-logger = logging.getLogger("moviechat")
-
-WEB_DIR = Path(__file__).resolve().parents[2] / "web"
-
-app = FastAPI(title="MovieChat API")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_methods=["GET", "POST"],
-    allow_headers=["*"],
-)
-
-
-# Whitelisted so an arbitrary string can never reach TMDB's sort_by param.
-SortBy = Literal[
-    "vote_average.desc",
-    "vote_average.asc",
-    "primary_release_date.desc",
-    "primary_release_date.asc",
-    "popularity.desc",
-    "revenue.desc",
-]
-
-
-class AIRequest(BaseModel):
-    text: str = Field(..., min_length=1, description="Natural language prompt")
-    content_type: Optional[str] = Field(default=None, description="Optional override: movie|series")
-    language: Optional[str] = Field(default=None, description="Optional override: en|hi|ko|ja etc")
-    page: int = Field(default=1, ge=1)
-    page_size: int = Field(default=10, ge=1, le=50)
-    sort_by: Optional[SortBy] = Field(
-        default=None,
-        description="Explicit sort; overrides any sort inferred from the text",
-    )
-
-
-@app.get("/health")
-def health():
-    return {"ok": True}
-
-
-@app.post("/ai")
-def ai(req: AIRequest):
-    if not req.text.strip():
-        raise HTTPException(status_code=422, detail="text must not be blank")
-
-    try:
-        return recommend_ai(
-            user_text=req.text,
-            content_type=req.content_type,
-            language=req.language,
-            page=req.page,
-            page_size=req.page_size,
-            sort_by=req.sort_by,
-        )
-    except RuntimeError as e:
-        # Missing/misconfigured API key (see src/core/providers.py)
-        logger.error("Configuration error: %s", e)
-        raise HTTPException(status_code=500, detail=str(e))
-    except Exception:
-        logger.exception("recommend_ai failed for text=%r", req.text)
-        raise HTTPException(status_code=502, detail="Upstream movie data provider failed. Please try again.")
-
-
-# Mounted last so the API routes above always take precedence over the
-# static file server. html=True serves web/index.html at "/".
-if WEB_DIR.is_dir():
-    app.mount("/", StaticFiles(directory=str(WEB_DIR), html=True), name="web")
-else:  # pragma: no cover - only when the frontend is absent
-    logger.warning("web/ directory not found at %s; serving API only", WEB_DIR)
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Literal, Optional
+
+from dotenv import load_dotenv
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+import orjson
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel, Field
+
+load_dotenv()
+
+from src.core.providers import tmdb_poster_url, tmdb_upcoming_movies
+from src.core.recommender import recommend_ai, recommend_ai_bulk
+
+logger = logging.getLogger("moviechat")
+
+WEB_DIR = Path(__file__).resolve().parents[2] / "web"
+
+# ORJSONResponse serializes with orjson (C, SIMD) instead of the stdlib
+# encoder — the /ai payloads carry full overviews for every item.
+app = FastAPI(title="MovieChat API", default_response_class=ORJSONResponse)
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_methods=["GET", "POST"],
+    allow_headers=["*"],
+)
+
+
+# Whitelisted so an arbitrary string can never reach TMDB's sort_by param.
+SortBy = Literal[
+    "vote_average.desc",
+    "vote_average.asc",
+    "primary_release_date.desc",
+    "primary_release_date.asc",
+    "popularity.desc",
+    "revenue.desc",
+]
+
+
+class AIRequest(BaseModel):
+    # Frozen: requests are read-only once validated, and pydantic-core skips
+    # the mutability bookkeeping for frozen models.
+    model_config = {"frozen": True}
+
+    text: str = Field(..., min_length=1, description="Natural language prompt")
+    content_type: Optional[str] = Field(default=None, description="Optional override: movie|series")
+    language: Optional[str] = Field(default=None, description="Optional override: en|hi|ko|ja etc")
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=10, ge=1, le=50)
+    sort_by: Optional[SortBy] = Field(
+        default=None,
+        description="Explicit sort; overrides any sort inferred from the text",
+    )
+
+
+class AIBulkRequest(BaseModel):
+    model_config = {"frozen": True}
+
+    text: str = Field(..., min_length=1, description="Natural language prompt")
+    content_type: Optional[str] = Field(default=None, description="Optional override: movie|series")
+    language: Optional[str] = Field(default=None, description="Optional override: en|hi|ko|ja etc")
+    pages: int = Field(default=2, ge=1, le=3, description="Pages to fetch and merge, starting at 1")
+    page_size: int = Field(default=10, ge=1, le=50)
+    sort_by: Optional[SortBy] = Field(
+        default=None,
+        description="Explicit sort; overrides any sort inferred from the text",
+    )
+
+
+@app.get("/health")
+def health():
+    return {"ok": True}
+
+
+# Prompts most sessions start from; warming them fills the intent, response
+# and disk caches so the first real user after a deploy skips the cold path.
+_WARMUP_PROMPTS = [
+    "action movies",
+    "comedy movies",
+    "feel good movies",
+    "best thriller series",
+    "hindi movies",
+    "horror movies",
+    "anime series",
+    "romantic comedies",
+]
+
+
+def _warmup() -> None:
+    for prompt in _WARMUP_PROMPTS:
+        try:
+            recommend_ai(user_text=prompt)
+        except Exception:
+            # Best-effort: a failed warmup just leaves that prompt cold.
+            logger.debug("cache warmup skipped for %r", prompt)
+
+
+@app.on_event("startup")
+def warm_caches():
+    # Opt-in via MOVIECHAT_WARMUP=1: the warmup spends real TMDB/Watchmode
+    # quota, which free-tier deployments may prefer to keep for users.
+    if os.getenv("MOVIECHAT_WARMUP", "").lower() in ("1", "true", "yes"):
+        threading.Thread(target=_warmup, daemon=True, name="moviechat-warmup").start()
+
+
+# Single-flight guard: the upcoming list is the same for everyone, so N
+# concurrent cold-cache callers should produce one TMDB fetch, not N. The
+# response itself is cached for an hour at the provider layer.
+_upcoming_lock = threading.Lock()
+
+
+@app.get("/upcoming")
+def upcoming(limit: int = 10):
+    limit = max(1, min(limit, 20))
+    try:
+        with _upcoming_lock:
+            results = tmdb_upcoming_movies(page=1).get("results", [])
+    except RuntimeError as e:
+        logger.error("Configuration error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("upcoming lookup failed")
+        raise HTTPException(status_code=502, detail="Upstream movie data provider failed. Please try again.")
+
+    return {
+        "items": [
+            {
+                "title": r.get("title"),
+                "overview": r.get("overview"),
+                "rating": r.get("vote_average"),
+                "release_date": r.get("release_date"),
+                "tmdb_id": r.get("id"),
+                "poster_url": tmdb_poster_url(r.get("poster_path"), size="w500"),
+            }
+            for r in results[:limit]
+        ]
+    }
+
+
+@app.post("/ai")
+def ai(req: AIRequest):
+    if not req.text.strip():
+        raise HTTPException(status_code=422, detail="text must not be blank")
+
+    try:
+        return recommend_ai(
+            user_text=req.text,
+            content_type=req.content_type,
+            language=req.language,
+            page=req.page,
+            page_size=req.page_size,
+            sort_by=req.sort_by,
+        )
+    except RuntimeError as e:
+        # Missing/misconfigured API key (see src/core/providers.py)
+        logger.error("Configuration error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("recommend_ai failed for text=%r", req.text)
+        raise HTTPException(status_code=502, detail="Upstream movie data provider failed. Please try again.")
+
+
+# NDJSON variant of /ai: one metadata line (page, intent echo), then one
+# line per ranked item. Clients can render each card as its line arrives
+# instead of waiting to download and parse the whole body. Items cannot be
+# emitted before enrichment finishes — the ranking is computed over the
+# complete page — so this streams delivery, not computation.
+@app.post("/ai/stream")
+def ai_stream(req: AIRequest):
+    if not req.text.strip():
+        raise HTTPException(status_code=422, detail="text must not be blank")
+
+    try:
+        data = recommend_ai(
+            user_text=req.text,
+            content_type=req.content_type,
+            language=req.language,
+            page=req.page,
+            page_size=req.page_size,
+            sort_by=req.sort_by,
+        )
+    except RuntimeError as e:
+        logger.error("Configuration error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("recommend_ai failed for text=%r", req.text)
+        raise HTTPException(status_code=502, detail="Upstream movie data provider failed. Please try again.")
+
+    def ndjson():
+        yield orjson.dumps({k: v for k, v in data.items() if k != "items"}) + b"\n"
+        for item in data["items"]:
+            yield orjson.dumps(item) + b"\n"
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# Several pages in one round trip, for clients that would otherwise click
+# "load more" straight through pages 1..N (see recommend_ai_bulk).
+@app.post("/ai/bulk")
+def ai_bulk(req: AIBulkRequest):
+    if not req.text.strip():
+        raise HTTPException(status_code=422, detail="text must not be blank")
+
+    try:
+        return recommend_ai_bulk(
+            user_text=req.text,
+            content_type=req.content_type,
+            language=req.language,
+            pages=req.pages,
+            page_size=req.page_size,
+            sort_by=req.sort_by,
+        )
+    except RuntimeError as e:
+        logger.error("Configuration error: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        logger.exception("recommend_ai_bulk failed for text=%r", req.text)
+        raise HTTPException(status_code=502, detail="Upstream movie data provider failed. Please try again.")
+
+
+# Mounted last so the API routes above always take precedence over the
+# static file server. html=True serves web/index.html at "/".
+if WEB_DIR.is_dir():
+    app.mount("/", StaticFiles(directory=str(WEB_DIR), html=True), name="web")
+else:  # pragma: no cover - only when the frontend is absent
+    logger.warning("web/ directory not found at %s; serving API only", WEB_DIR)
@@ -11,8 +11,10 @@ person named "highest rated horror": every word is consumed by the sort,
 genre and content-type stages, leaving an empty residual.
 """
 
+import datetime
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 
 from .vocabulary import (
@@ -88,42 +90,140 @@ def _is_negated(text: str, start: int) -> bool:
     return any(cue in window for cue in NEGATION_CUES)
 
 
-def _term_pattern(term: str) -> str:
-    """Word-boundary pattern tolerant of hyphen/space variation."""
-    return r"\b" + re.escape(term).replace(r"\ ", r"[\s\-]+") + r"\b"
+@lru_cache(maxsize=None)
+def _term_re(term: str) -> "re.Pattern":
+    """Word-boundary pattern tolerant of hyphen/space variation.
 
+    Compiled once per vocabulary term: the vocabularies are fixed at import
+    time, so after the first request every lookup is a cache hit and the hot
+    path never re-enters ``re`` pattern parsing.
+    """
+    return re.compile(r"\b" + re.escape(term).replace(r"\ ", r"[\s\-]+") + r"\b")
 
-def _extract_years(text: str) -> Tuple[Optional[int], Optional[int], List[Tuple[int, int]]]:
+
+def _vocab_union(terms) -> "re.Pattern":
+    """One alternation over a whole vocabulary, so a stage scans the query
+    once instead of once per term. Alternatives are ordered longest-first so
+    multi-word terms beat their own prefixes ("science fiction" over "sci").
+    """
+    alts = sorted(terms, key=len, reverse=True)
+    return re.compile(
+        r"\b(?:" + "|".join(re.escape(x).replace(r"\ ", r"[\s\-]+") for x in alts) + r")\b"
+    )
+
+
+# Maps a matched variant back to its vocabulary key ("feel-good" -> "feel good").
+_RE_SEP = re.compile(r"[\s\-]+")
+
+
+def _canon(matched_text: str) -> str:
+    return _RE_SEP.sub(" ", matched_text)
+
+
+_MOOD_UNION = _vocab_union(MOOD_TERMS)
+_GENRE_UNION = _vocab_union(MOVIE_GENRES)
+_KEYWORD_UNION = _vocab_union(KEYWORD_TERMS)
+
+
+def _prioritized_vocab(groups):
+    """Union pattern + reverse map for a stage whose groups are tried in
+    listed order (sort, language, content type, role). The reverse map sends
+    each matched variant straight to its (group rank, term, payload), so one
+    scan replaces the nested per-term loops without changing which group wins.
+    """
+    index: Dict[str, Tuple[int, str, object]] = {}
+    terms: List[str] = []
+    for rank, (group, payload) in enumerate(groups):
+        for term in group:
+            index.setdefault(_canon(term), (rank, term, payload))
+            terms.append(term)
+    return _vocab_union(terms), index
+
+
+def _first_prioritized_hit(pattern, index, t):
+    """The same winner the nested loops chose: best group rank first, then
+    the longest term, then the earliest occurrence."""
+    best = best_key = None
+    for mm in pattern.finditer(t):
+        rank, term, payload = index[_canon(mm.group(0))]
+        key = (rank, -len(term), mm.start())
+        if best_key is None or key < best_key:
+            best_key = key
+            best = (term, mm, payload)
+    return best
+
+
+_SORT_UNION, _SORT_INDEX = _prioritized_vocab(
+    [(terms, (sort_by, needs_floor)) for terms, sort_by, needs_floor in SORT_TERMS]
+)
+_LANG_UNION, _LANG_INDEX = _prioritized_vocab(LANG_HINTS)
+_CONTENT_UNION, _CONTENT_INDEX = _prioritized_vocab(
+    [(terms, ctype) for ctype, terms in CONTENT_HINTS.items()]
+)
+_ROLE_UNION, _ROLE_INDEX = _prioritized_vocab(ROLE_TERMS)
+
+
+# Fixed patterns used by parse_intent/_extract_years, compiled at module load
+# so the per-request cost is only the scan itself.
+_RE_SPACE = re.compile(r"\s+")
+_RE_LIMIT_TOP = re.compile(r"\b(?:top|best)\s+(\d{1,3})\b")
+_RE_LIMIT_COUNT = re.compile(r"\b(\d{1,3})\s+(?:movies|films|shows|series|recommendations|recs)\b")
+_RE_RATING_FLOOR = re.compile(
+    r"\b(?:rating|rated|score)\s*(?:above|over|greater than|at least|>=?)\s*(\d(?:\.\d)?)\b"
+)
+_RE_RATING_PLUS = re.compile(r"\b(\d(?:\.\d)?)\s*\+\s*(?:rating|rated|stars?)\b")
+_RE_ANIME = re.compile(r"\banime\b")
+_RE_RUNTIME_UNDER = re.compile(r"\bunder\s+(\d{1,3})\s*(?:min|mins|minutes)\b")
+_RE_SEED = re.compile(
+    r"(?<!don't )(?<!do not )(?<!not )\b(?:like|similar to|reminds me of)\b\s+(.+?)\s*$"
+)
+_RE_SEED_TRAIL = re.compile(r"\b(?:on|from)\b.*$")
+_RE_YEAR_BETWEEN = re.compile(
+    r"\bbetween\s+(19\d{2}|20\d{2})\s+(?:and|to|-)\s+(19\d{2}|20\d{2})\b"
+)
+_RE_YEAR_LAST_N = re.compile(r"\b(?:last|past)\s+(\d{1,2})\s+years?\b")
+_RE_YEAR_AFTER = re.compile(r"\b(after|since|from)\s+(19\d{2}|20\d{2})\b")
+_RE_YEAR_BEFORE = re.compile(r"\b(before|until|up to|prior to)\s+(19\d{2}|20\d{2})\b")
+_RE_YEAR = re.compile(r"\b(19\d{2}|20\d{2})\b")
+_RE_NOISE_PUNCT = re.compile(r"[<>{}\[\]()*;|\\/\"!?,+=#$%^~`]")
+_RE_NUMERIC_ONLY = re.compile(r"[\d\s\-.]+")
+
+
+def _extract_years(text: str, today_year: int) -> Tuple[Optional[int], Optional[int], List[Tuple[int, int]]]:
     """Return (year_from, year_to, spans_to_mask)."""
     spans: List[Tuple[int, int]] = []
     year_from = year_to = None
 
-    m = re.search(r"\bbetween\s+(19\d{2}|20\d{2})\s+(?:and|to|-)\s+(19\d{2}|20\d{2})\b", text)
+    # Every pattern below needs a digit; most prompts have none, so one
+    # cheap character scan spares them all five regex passes.
+    if not any(ch.isdigit() for ch in text):
+        return year_from, year_to, spans
+
+    m = _RE_YEAR_BETWEEN.search(text)
     if m:
         a, b = int(m.group(1)), int(m.group(2))
         spans.append(m.span())
         return min(a, b), max(a, b), spans
 
-    m = re.search(r"\b(?:last|past)\s+(\d{1,2})\s+years?\b", text)
+    m = _RE_YEAR_LAST_N.search(text)
     if m:
-        import datetime
         n = int(m.group(1))
         spans.append(m.span())
-        return datetime.date.today().year - n, None, spans
+        return today_year - n, None, spans
 
-    m = re.search(r"\b(after|since|from)\s+(19\d{2}|20\d{2})\b", text)
+    m = _RE_YEAR_AFTER.search(text)
     if m:
         y = int(m.group(2))
         spans.append(m.span())
         return (y + 1 if m.group(1) == "after" else y), None, spans
 
-    m = re.search(r"\b(before|until|up to|prior to)\s+(19\d{2}|20\d{2})\b", text)
+    m = _RE_YEAR_BEFORE.search(text)
     if m:
         y = int(m.group(2))
         spans.append(m.span())
         return None, (y - 1 if m.group(1) == "before" else y), spans
 
-    years = [(int(mm.group(0)), mm.span()) for mm in re.finditer(r"\b(19\d{2}|20\d{2})\b", text)]
+    years = [(int(mm.group(0)), mm.span()) for mm in _RE_YEAR.finditer(text)]
     if len(years) == 1:
         y, span = years[0]
         spans.append(span)
@@ -133,21 +233,40 @@ def _extract_years(text: str) -> Tuple[Optional[int], Optional[int], List[Tuple[
 
 
 def parse_intent(text: str) -> Intent:
+    """Parse a natural-language query into an Intent.
+
+    Results are memoized per (text, current year) — pagination ("Load
+    more") re-sends the identical prompt for every page and retried
+    prompts are common. The year is part of the cache key because
+    "last N years" resolves against today; keyed on text alone, a cached
+    Intent would pin year_from at whatever year the prompt was first
+    parsed. Callers must treat the returned Intent as read-only and copy
+    any list field before modifying it (recommend_ai already does).
+    """
+    return _parse_intent(text, datetime.date.today().year)
+
+
+@lru_cache(maxsize=2048)
+def _parse_intent(text: str, today_year: int) -> Intent:
     raw = (text or "").strip()
-    t = " " + re.sub(r"\s+", " ", raw.lower()) + " "
+    t = " " + _RE_SPACE.sub(" ", raw.lower()) + " "
 
     intent = Intent()
     matched: List[Tuple[str, str]] = []
+    # Membership sentinels for the genre buckets, so appends stay unique
+    # without a rebuild pass at the end.
+    seen_inc: set = set()
+    seen_exc: set = set()
 
     # ---- 0) strip conversational lead-ins -------------------------------
     for lead in _LEAD_INS:
-        for m in re.finditer(_term_pattern(lead), t):
+        for m in _term_re(lead).finditer(t):
             t = _mask(t, *m.span())
 
     # ---- 1) explicit result limit ("top 5") -----------------------------
-    m = re.search(r"\b(?:top|best)\s+(\d{1,3})\b", t)
+    m = _RE_LIMIT_TOP.search(t)
     if not m:
-        m = re.search(r"\b(\d{1,3})\s+(?:movies|films|shows|series|recommendations|recs)\b", t)
+        m = _RE_LIMIT_COUNT.search(t)
     if m:
         n = int(m.group(1))
         if 1 <= n <= 50:
@@ -156,26 +275,19 @@ def parse_intent(text: str) -> Intent:
         t = _mask(t, *m.span())
 
     # ---- 2) sort intent -------------------------------------------------
-    for terms, sort_by, needs_floor in SORT_TERMS:
-        hit = None
-        for term in sorted(terms, key=len, reverse=True):
-            mm = re.search(_term_pattern(term), t)
-            if mm:
-                hit = (term, mm)
-                break
-        if hit:
-            term, mm = hit
-            intent.sort_by = sort_by
-            if needs_floor:
-                intent.min_votes = RATING_SORT_VOTE_FLOOR
-            matched.append(("sort", term))
-            t = _mask(t, *mm.span())
-            break
+    hit = _first_prioritized_hit(_SORT_UNION, _SORT_INDEX, t)
+    if hit:
+        term, mm, (sort_by, needs_floor) = hit
+        intent.sort_by = sort_by
+        if needs_floor:
+            intent.min_votes = RATING_SORT_VOTE_FLOOR
+        matched.append(("sort", term))
+        t = _mask(t, *mm.span())
 
     # ---- 3) explicit rating floor ---------------------------------------
-    m = re.search(r"\b(?:rating|rated|score)\s*(?:above|over|greater than|at least|>=?)\s*(\d(?:\.\d)?)\b", t)
+    m = _RE_RATING_FLOOR.search(t)
     if not m:
-        m = re.search(r"\b(\d(?:\.\d)?)\s*\+\s*(?:rating|rated|stars?)\b", t)
+        m = _RE_RATING_PLUS.search(t)
     if m:
         try:
             intent.min_rating = float(m.group(1))
@@ -185,91 +297,84 @@ def parse_intent(text: str) -> Intent:
         t = _mask(t, *m.span())
 
     # ---- 4) moods (multi-word, before single-word genres) ---------------
-    for term in sorted(MOOD_TERMS, key=len, reverse=True):
-        mm = re.search(_term_pattern(term), t)
-        if not mm:
-            continue
-        bucket = intent.exclude_genres if _is_negated(t, mm.start()) else intent.genres
+    seen_moods = set()
+    for mm in _MOOD_UNION.finditer(t):
+        term = _canon(mm.group(0))
+        if _is_negated(t, mm.start()):
+            bucket, seen = intent.exclude_genres, seen_exc
+        else:
+            bucket, seen = intent.genres, seen_inc
         for gid in MOOD_TERMS[term]:
-            if gid not in bucket:
+            if gid not in seen:
+                seen.add(gid)
                 bucket.append(gid)
-        matched.append(("mood", term))
+        if term not in seen_moods:
+            seen_moods.add(term)
+            matched.append(("mood", term))
         t = _mask(t, *mm.span())
 
     # ---- 5) genres ------------------------------------------------------
-    for term in sorted(MOVIE_GENRES, key=len, reverse=True):
-        mm = re.search(_term_pattern(term), t)
-        if not mm:
-            continue
+    seen_genres = set()
+    for mm in _GENRE_UNION.finditer(t):
+        term = _canon(mm.group(0))
         gid = MOVIE_GENRES[term]
         negated = _is_negated(t, mm.start())
-        bucket = intent.exclude_genres if negated else intent.genres
-        if gid not in bucket:
+        bucket, seen = (intent.exclude_genres, seen_exc) if negated else (intent.genres, seen_inc)
+        if gid not in seen:
+            seen.add(gid)
             bucket.append(gid)
-        matched.append(("exclude_genre" if negated else "genre", term))
+        if (term, negated) not in seen_genres:
+            seen_genres.add((term, negated))
+            matched.append(("exclude_genre" if negated else "genre", term))
         # "anime" also implies Japanese; don't mask it away from the language pass
         if term != "anime":
             t = _mask(t, *mm.span())
 
     # ---- 6) thematic keywords -------------------------------------------
-    for term in sorted(KEYWORD_TERMS, key=len, reverse=True):
-        mm = re.search(_term_pattern(term), t)
-        if mm and term not in intent.keywords:
+    for mm in _KEYWORD_UNION.finditer(t):
+        term = _canon(mm.group(0))
+        if term not in intent.keywords:
             intent.keywords.append(term)
             matched.append(("keyword", term))
-            t = _mask(t, *mm.span())
+        t = _mask(t, *mm.span())
 
     # ---- 7) language ----------------------------------------------------
-    for terms, code in LANG_HINTS:
-        hit = None
-        for term in sorted(terms, key=len, reverse=True):
-            mm = re.search(_term_pattern(term), t)
-            if mm:
-                hit = (term, mm)
-                break
-        if hit:
-            term, mm = hit
-            intent.language = code
-            matched.append(("language", term))
-            t = _mask(t, *mm.span())
-            break
-    if intent.language is None and re.search(r"\banime\b", t):
+    hit = _first_prioritized_hit(_LANG_UNION, _LANG_INDEX, t)
+    if hit:
+        term, mm, code = hit
+        intent.language = code
+        matched.append(("language", term))
+        t = _mask(t, *mm.span())
+    if intent.language is None and _RE_ANIME.search(t):
         intent.language = "ja"
         matched.append(("language", "anime"))
-    t = re.sub(r"\banime\b", "     ", t)
+    t = _RE_ANIME.sub("     ", t)
 
     # ---- 8) content type ------------------------------------------------
-    for ctype, terms in CONTENT_HINTS.items():
-        hit = None
-        for term in sorted(terms, key=len, reverse=True):
-            mm = re.search(_term_pattern(term), t)
-            if mm:
-                hit = (term, mm)
-                break
-        if hit:
-            term, mm = hit
-            intent.content_type = ctype
-            matched.append(("content_type", term))
-            t = _mask(t, *mm.span())
-            break
+    hit = _first_prioritized_hit(_CONTENT_UNION, _CONTENT_INDEX, t)
+    if hit:
+        term, mm, ctype = hit
+        intent.content_type = ctype
+        matched.append(("content_type", term))
+        t = _mask(t, *mm.span())
 
     # ---- 9) decades and years -------------------------------------------
     for term in sorted(DECADES, key=len, reverse=True):
-        mm = re.search(_term_pattern(term), t)
+        mm = _term_re(term).search(t)
         if mm:
             intent.year_from, intent.year_to = DECADES[term]
             matched.append(("era", term))
             t = _mask(t, *mm.span())
             break
     if intent.year_from is None and intent.year_to is None:
-        yf, yt, spans = _extract_years(t)
+        yf, yt, spans = _extract_years(t, today_year)
         intent.year_from, intent.year_to = yf, yt
         for s, e in spans:
             matched.append(("year", t[s:e].strip()))
             t = _mask(t, s, e)
 
     # ---- 10) runtime ----------------------------------------------------
-    m = re.search(r"\bunder\s+(\d{1,3})\s*(?:min|mins|minutes)\b", t)
+    m = _RE_RUNTIME_UNDER.search(t)
     if m:
         intent.runtime_lte = int(m.group(1))
         matched.append(("runtime", m.group(0).strip()))
@@ -278,7 +383,7 @@ def parse_intent(text: str) -> Intent:
     # Qualitative runtime words are consumed either way, so an explicit
     # "under 100 minutes" does not leave a stray "short" in the residual.
     for terms, direction, minutes in RUNTIME_TERMS:
-        mm = next((x for x in (re.search(_term_pattern(term), t) for term in terms) if x), None)
+        mm = next((x for x in (_term_re(term).search(t) for term in terms) if x), None)
         if not mm:
             continue
         if intent.runtime_lte is None and intent.runtime_gte is None:
@@ -291,9 +396,9 @@ def parse_intent(text: str) -> Intent:
         break
 
     # ---- 11) seed title ("like X") --------------------------------------
-    m = re.search(r"(?<!don't )(?<!do not )(?<!not )\b(?:like|similar to|reminds me of)\b\s+(.+?)\s*$", t)
+    m = _RE_SEED.search(t)
     if m:
-        seed = re.sub(r"\b(?:on|from)\b.*$", "", m.group(1)).strip()
+        seed = _RE_SEED_TRAIL.sub("", m.group(1)).strip()
         seed = " ".join(w for w in seed.split() if w not in _FILLER)
         if seed:
             intent.seed_title = seed
@@ -301,43 +406,35 @@ def parse_intent(text: str) -> Intent:
         t = _mask(t, *m.span())
 
     # ---- 12) person role hint -------------------------------------------
-    for terms, role in ROLE_TERMS:
-        hit = None
-        for term in sorted(terms, key=len, reverse=True):
-            mm = re.search(_term_pattern(term), t)
-            if mm:
-                hit = (term, mm)
-                break
-        if hit:
-            term, mm = hit
-            intent.person_role = role
-            matched.append(("role", term))
-            t = _mask(t, *mm.span())
-            break
+    hit = _first_prioritized_hit(_ROLE_UNION, _ROLE_INDEX, t)
+    if hit:
+        term, mm, role = hit
+        intent.person_role = role
+        matched.append(("role", term))
+        t = _mask(t, *mm.span())
 
     # ---- 13) residual ---------------------------------------------------
     # Negation cues have served their purpose (steps 4-5) and must not leak
     # into the residual, or "action but not horror" would search for "but not".
     for cue in NEGATION_CUES:
-        for mm in re.finditer(_term_pattern(cue.strip()), t):
+        for mm in _term_re(cue.strip()).finditer(t):
             t = _mask(t, *mm.span())
 
     # Strip only noisy punctuation. A \w whitelist would silently destroy
     # non-Latin scripts by dropping Unicode combining marks (मूवी -> म व).
-    cleaned = re.sub(r"[<>{}\[\]()*;|\\/\"!?,+=#$%^~`]", " ", t)
+    cleaned = _RE_NOISE_PUNCT.sub(" ", t)
     leftover = [
         w for w in cleaned.split()
         if w not in _FILLER and any(ch.isalnum() for ch in w)
     ]
     residual = " ".join(leftover).strip()
-    if residual and not re.fullmatch(r"[\d\s\-.]+", residual):
+    if residual and not _RE_NUMERIC_ONLY.fullmatch(residual):
         intent.residual = residual
         if intent.person_role:
             intent.person_name = residual
 
-    intent.genres = list(dict.fromkeys(intent.genres))
-    intent.exclude_genres = list(dict.fromkeys(intent.exclude_genres))
     # A genre cannot be both wanted and unwanted; explicit exclusion wins.
-    intent.genres = [g for g in intent.genres if g not in intent.exclude_genres]
+    # Both buckets are already unique thanks to the append-time sentinels.
+    intent.genres = [g for g in intent.genres if g not in seen_exc]
     intent.matched_terms = matched
     return intent
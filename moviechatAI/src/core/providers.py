@@ -1,8 +1,11 @@
 import datetime
 import os
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import requests
 from dotenv import load_dotenv
 from requests.adapters import HTTPAdapter
@@ -24,10 +27,51 @@ _retry = Retry(
     status_forcelist=[429, 500, 502, 503, 504],
     allowed_methods=["GET"],
 )
-_session.mount("https://", HTTPAdapter(max_retries=_retry, pool_maxsize=20))
-_session.mount("http://", HTTPAdapter(max_retries=_retry, pool_maxsize=20))
+_session.mount("https://", HTTPAdapter(max_retries=_retry, pool_connections=20, pool_maxsize=20))
+_session.mount("http://", HTTPAdapter(max_retries=_retry, pool_connections=20, pool_maxsize=20))
 
 
+# Identical TMDB queries return the same page for hours, yet every user
+# request used to refetch. GETs are cached with a TTL so repeat queries
+# (pagination, retried prompts, shared popular searches) skip the network
+# entirely. Keys exclude the API key so rotation doesn't fragment the cache;
+# the cap keeps a long-running worker from growing without bound.
+_RESPONSE_CACHE_TTL = 3600.0
+_RESPONSE_CACHE_MAX = 2048
+_RESPONSE_CACHE: Dict[Tuple, Tuple[float, Any]] = {}
+
+
+def _get_json(url: str, params: Dict[str, Any]) -> Any:
+    key = (url,) + tuple(
+        sorted((k, str(v)) for k, v in params.items() if k not in ("api_key", "apiKey"))
+    )
+    now = time.time()
+    hit = _RESPONSE_CACHE.get(key)
+    if hit and hit[0] > now:
+        return hit[1]
+
+    r = _session.get(url, params=params, timeout=30)
+    r.raise_for_status()
+    # orjson parses the raw bytes directly; TMDB discover pages run tens of
+    # KB and the stdlib decoder shows up in profiles at that size.
+    try:
+        data = orjson.loads(r.content)
+    except orjson.JSONDecodeError as e:
+        # Keep r.json()'s exception contract: a malformed body must surface
+        # as a RequestException so callers' _safe_call fallthrough still
+        # treats it as a transient upstream fault, not a server error.
+        raise requests.exceptions.InvalidJSONError(e, response=r)
+
+    if len(_RESPONSE_CACHE) >= _RESPONSE_CACHE_MAX:
+        _RESPONSE_CACHE.clear()  # crude but bounded; entries rebuild on demand
+    _RESPONSE_CACHE[key] = (now + _RESPONSE_CACHE_TTL, data)
+    return data
+
+
+# Cached: the keys are fixed for the life of the process but these getters
+# run on every provider call. A raise (key missing) is not cached, so the
+# configuration error keeps surfacing until the key appears.
+@lru_cache(maxsize=1)
 def _tmdb_key() -> str:
     key = os.getenv("TMDB_API_KEY")
     if not key:
@@ -35,6 +79,7 @@ def _tmdb_key() -> str:
     return key
 
 
+@lru_cache(maxsize=1)
 def _watchmode_key() -> str:
     key = os.getenv("WATCHMODE_API_KEY")
     if not key:
@@ -42,12 +87,16 @@ def _watchmode_key() -> str:
     return key
 
 
+# Cached: the same posters come back on every popular query, so the
+# assembled URLs are shared across requests instead of re-formatted.
+@lru_cache(maxsize=8192)
 def tmdb_poster_url(poster_path: Optional[str], size: str = "w500") -> Optional[str]:
     if not poster_path:
         return None
     return f"{TMDB_IMAGE_BASE}/{size}{poster_path}"
 
 
+@lru_cache(maxsize=8192)
 def tmdb_backdrop_url(backdrop_path: Optional[str], size: str = "w780") -> Optional[str]:
     if not backdrop_path:
         return None
@@ -130,9 +179,7 @@ def tmdb_discover_movie(
         # have no ratings yet (Avatar 5, 2031).
         params["primary_release_date.lte"] = _today()
 
-    r = _session.get(f"{TMDB_BASE}/discover/movie", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/discover/movie", params)
 
 
 def tmdb_discover_tv(
@@ -161,56 +208,66 @@ def tmdb_discover_tv(
     elif params.get("sort_by") == "first_air_date.desc":
         params["first_air_date.lte"] = _today()
 
-    r = _session.get(f"{TMDB_BASE}/discover/tv", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/discover/tv", params)
 
 
 def tmdb_search_movie(query: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "query": query, "page": page, "include_adult": "false"}
-    r = _session.get(f"{TMDB_BASE}/search/movie", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/search/movie", params)
 
 
 def tmdb_search_tv(query: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "query": query, "page": page, "include_adult": "false"}
-    r = _session.get(f"{TMDB_BASE}/search/tv", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/search/tv", params)
 
 
 def tmdb_similar(tmdb_id: int, media_type: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "page": page}
-    r = _session.get(f"{TMDB_BASE}/{media_type}/{tmdb_id}/similar", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/{media_type}/{tmdb_id}/similar", params)
 
 
-def tmdb_get_trailer_url(tmdb_id: int, media_type: str) -> Optional[str]:
-    params = {"api_key": _tmdb_key()}
-    r = _session.get(f"{TMDB_BASE}/{media_type}/{tmdb_id}/videos", params=params, timeout=30)
-    r.raise_for_status()
+def tmdb_detail(tmdb_id: int, media_type: str, append_to_response: str = "videos") -> Dict[str, Any]:
+    """Fetch a title's detail page, with extra sections coalesced into the
+    same request via TMDB's append_to_response (e.g. "videos,credits").
+    One round trip serves everything callers need to know about a title.
+    """
+    params: Dict[str, Any] = {"api_key": _tmdb_key()}
+    if append_to_response:
+        params["append_to_response"] = append_to_response
+    return _get_json(f"{TMDB_BASE}/{media_type}/{tmdb_id}", params)
 
-    results = r.json().get("results", [])
-    for v in results:
-        if v.get("site") == "YouTube" and v.get("type") == "Trailer":
-            key = v.get("key")
-            if key:
-                return f"https://www.youtube.com/watch?v={key}"
+
+def _pick_trailer(results: List[Dict[str, Any]]) -> Optional[str]:
+    """Choose the best YouTube video from a TMDB videos list.
+
+    Single pass: a proper Trailer ends the scan immediately, any other
+    YouTube video is kept as a fallback in case no Trailer appears later.
+    Popular titles carry 10-30 videos, so one walk beats two.
+    """
+    fallback = None
     for v in results:
-        if v.get("site") == "YouTube":
-            key = v.get("key")
-            if key:
-                return f"https://www.youtube.com/watch?v={key}"
-    return None
+        if v.get("site") != "YouTube":
+            continue
+        key = v.get("key")
+        if not key:
+            continue
+        if v.get("type") == "Trailer":
+            return f"https://www.youtube.com/watch?v={key}"
+        if fallback is None:
+            fallback = key
+    return f"https://www.youtube.com/watch?v={fallback}" if fallback else None
+
+
+def tmdb_get_trailer_url(tmdb_id: int, media_type: str) -> Optional[str]:
+    # Videos ride along on the detail request, so a later detail lookup for
+    # the same title is a cache hit instead of a second round trip.
+    detail = tmdb_detail(tmdb_id, media_type, append_to_response="videos")
+    return _pick_trailer((detail.get("videos") or {}).get("results", []))
 
 
 def tmdb_upcoming_movies(page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "page": page}
-    r = _session.get(f"{TMDB_BASE}/movie/upcoming", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/movie/upcoming", params)
 
 
 def watchmode_search(title: str) -> Dict[str, Any]:
@@ -228,28 +285,20 @@ def watchmode_sources(title_id: int, region: str = "US") -> List[Dict[str, Any]]
 
 def tmdb_search_multi(query: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "query": query, "page": page, "include_adult": "false"}
-    r = _session.get(f"{TMDB_BASE}/search/multi", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/search/multi", params)
 
 
 def tmdb_search_person(query: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "query": query, "page": page, "include_adult": "false"}
-    r = _session.get(f"{TMDB_BASE}/search/person", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/search/person", params)
 
 
 def tmdb_person_credits(person_id: int) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key()}
-    r = _session.get(f"{TMDB_BASE}/person/{person_id}/combined_credits", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/person/{person_id}/combined_credits", params)
 
 
 def tmdb_search_keyword(query: str, page: int = 1) -> Dict[str, Any]:
     params = {"api_key": _tmdb_key(), "query": query, "page": page}
-    r = _session.get(f"{TMDB_BASE}/search/keyword", params=params, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _get_json(f"{TMDB_BASE}/search/keyword", params)
 
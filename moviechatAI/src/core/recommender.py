@@ -1,9 +1,14 @@
 import os
 import re
+import sqlite3
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -39,15 +44,143 @@ from .providers import (
 load_dotenv(Path(__file__).resolve().parents[2] / ".env")
 DEFAULT_REGION = os.getenv("DEFAULT_REGION", "US")
 
+# Availability is a nice-to-have: without a Watchmode key every lookup would
+# just raise inside its try/except and burn the rate-gate delay per title.
+# Checked once; deployments without the key skip the whole code path.
+_WATCHMODE_ENABLED = bool(os.getenv("WATCHMODE_API_KEY"))
+
 AVAILABILITY_LOOKUPS_PER_REQUEST = 5
 TRAILER_LOOKUPS_PER_REQUEST = 4
-WATCHMODE_SLEEP_BETWEEN_CALLS = 0.10
+WATCHMODE_MIN_CALL_INTERVAL = 0.10
+
+
+class _RateGate:
+    """Minimum-interval gate shared across threads.
+
+    Each wait() reserves the next call slot; it blocks only for however much
+    of the interval is still outstanding. Unlike the fixed sleep this
+    replaces, a call that arrives after a long idle gap pays nothing, and
+    cache hits never reach the gate at all.
+    """
+
+    def __init__(self, interval: float):
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self._interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+_WATCHMODE_GATE = _RateGate(WATCHMODE_MIN_CALL_INTERVAL)
+
+# Shared worker pool for fanning out independent provider calls. The work is
+# pure network wait, so threads overlap the round trips instead of paying
+# sum-of-latencies on the request path.
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="moviechat")
+
+# Separate pool for whole-page fan-out (recommend_ai_bulk). Pages block on
+# enrichment futures that run in _POOL; giving them their own workers means
+# queued pages can never starve the inner lookups they are waiting on.
+_PAGE_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix="moviechat-page")
+
+_MISS = object()
+
+
+class _DiskCache:
+    """Minimal SQLite-backed TTL cache.
+
+    The module-level dicts below stay in front as the hot path; this layer
+    only answers when a freshly started worker sees a key some earlier
+    process already paid the network round trip for. Values are stored as
+    orjson documents, so only JSON-shaped values belong here. Any sqlite
+    failure (read-only filesystem, corrupt file) degrades to a no-op cache.
+    """
+
+    def __init__(self, path: Path, ttl: float):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)"
+            )
+            self._db.commit()
+        except (OSError, sqlite3.Error):
+            self._db = None
+
+    def get(self, key):
+        if self._db is None:
+            return _MISS
+        try:
+            with self._lock:
+                row = self._db.execute(
+                    "SELECT expires, value FROM cache WHERE key = ?", (repr(key),)
+                ).fetchone()
+        except sqlite3.Error:
+            return _MISS
+        if row is None or row[0] <= time.time():
+            return _MISS  # expired rows are overwritten on the next set
+        try:
+            return orjson.loads(row[1])
+        except orjson.JSONDecodeError:
+            return _MISS
+
+    def set(self, key, value) -> None:
+        if self._db is None:
+            return
+        try:
+            blob = orjson.dumps(value)
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                    (repr(key), time.time() + self._ttl, blob),
+                )
+                self._db.commit()
+        except (sqlite3.Error, TypeError):
+            pass
+
+
+_CACHE_DIR = Path(__file__).resolve().parents[2] / ".cache"
+
+# Bounded like the provider-layer response cache: clear-on-full is crude but
+# keeps a long-running worker from growing without limit, and since chunk1-3
+# the disk layer refills evicted entries without a network round trip.
+_LOCAL_CACHE_MAX = 4096
 
 _WATCHMODE_ID_CACHE: Dict[str, Optional[int]] = {}
-_WATCHMODE_SOURCES_CACHE: Dict[Tuple[str, str], List[Dict]] = {}
+_WATCHMODE_SOURCES_CACHE: Dict[Tuple[str, str], str] = {}
 _TRAILER_CACHE: Dict[Tuple[int, str], Optional[str]] = {}
 
 
+def _cache_put(cache: Dict, key, value) -> None:
+    if len(cache) >= _LOCAL_CACHE_MAX:
+        cache.clear()
+    cache[key] = value
+
+# Whole-response cache for recommend_ai: identical /ai POSTs (page reloads,
+# a session resent after the UI lost state, several users asking the popular
+# prompts) skip the entire pipeline, not just the sub-calls. Same TTL as the
+# provider response cache — the underlying TMDB pages turn over hourly at
+# most — and the same crude clear-on-full bound.
+_RESULT_CACHE_TTL = 3600.0
+_RESULT_CACHE_MAX = 512
+_RESULT_CACHE: Dict[Tuple, Tuple[float, Dict]] = {}
+
+# Watchmode id->title mappings and trailer URLs are near-immutable; streaming
+# availability shifts with catalog changes, so it expires sooner.
+_WATCHMODE_ID_DISK = _DiskCache(_CACHE_DIR / "watchmode_ids.sqlite3", ttl=24 * 3600.0)
+_WATCHMODE_SOURCES_DISK = _DiskCache(_CACHE_DIR / "watchmode_sources.sqlite3", ttl=6 * 3600.0)
+_TRAILER_DISK = _DiskCache(_CACHE_DIR / "trailers.sqlite3", ttl=24 * 3600.0)
+
+
+@lru_cache(maxsize=64)
 def _normalize_content_type(ct: str) -> str:
     ct = (ct or "").strip().lower()
     if ct in ("movie", "movies"):
@@ -74,66 +207,112 @@ def _popularity(item: Dict) -> float:
 def _best_watchmode_id(title: str) -> Optional[int]:
     if title in _WATCHMODE_ID_CACHE:
         return _WATCHMODE_ID_CACHE[title]
+    hit = _WATCHMODE_ID_DISK.get(title)
+    if hit is not _MISS:
+        _cache_put(_WATCHMODE_ID_CACHE, title, hit)
+        return hit
     try:
+        _WATCHMODE_GATE.wait()
         data = watchmode_search(title)
         results = data.get("title_results", [])
         wm_id = results[0].get("id") if results else None
-        _WATCHMODE_ID_CACHE[title] = wm_id
+        _cache_put(_WATCHMODE_ID_CACHE, title, wm_id)
+        _WATCHMODE_ID_DISK.set(title, wm_id)
         return wm_id
     except Exception:
-        _WATCHMODE_ID_CACHE[title] = None
+        # Transient failures are only remembered in-process, never on disk.
+        _cache_put(_WATCHMODE_ID_CACHE, title, None)
         return None
 
 
-def _watchmode_sources_cached(title: str, region: str) -> List[Dict]:
+def _format_sources(sources: List[Dict]) -> str:
+    # One pass with an early exit: big titles list the same platform once
+    # per offer type (sub/rent/buy), so collecting everything just to throw
+    # most of it away after a second dedupe pass wastes the walk.
+    seen = set()
+    names = []
+    for s in sources:
+        nm = s.get("name") or s.get("source")
+        if nm and nm not in seen:
+            seen.add(nm)
+            names.append(nm)
+            if len(names) == 6:
+                break
+    return ", ".join(names)
+
+
+def _availability_text(title: str, region: str) -> str:
+    if not _WATCHMODE_ENABLED:
+        return ""
+    # The caches hold the finished display string, formatted once at ingest
+    # — a hit costs a dict lookup, not a re-walk of the raw sources list.
     key = (title, region)
     if key in _WATCHMODE_SOURCES_CACHE:
         return _WATCHMODE_SOURCES_CACHE[key]
+    hit = _WATCHMODE_SOURCES_DISK.get(key)
+    if hit is not _MISS:
+        _cache_put(_WATCHMODE_SOURCES_CACHE, key, hit)
+        return hit
 
     wm_id = _best_watchmode_id(title)
     if wm_id is None:
-        _WATCHMODE_SOURCES_CACHE[key] = []
-        return []
+        _cache_put(_WATCHMODE_SOURCES_CACHE, key, "")
+        return ""
 
     try:
-        sources = watchmode_sources(wm_id, region=region)
+        _WATCHMODE_GATE.wait()
+        text = _format_sources(watchmode_sources(wm_id, region=region))
+        _WATCHMODE_SOURCES_DISK.set(key, text)
     except Exception:
-        sources = []
+        # Transient failures are only remembered in-process, never on disk.
+        text = ""
 
-    _WATCHMODE_SOURCES_CACHE[key] = sources
-    return sources
+    _cache_put(_WATCHMODE_SOURCES_CACHE, key, text)
+    return text
 
 
-def _availability_text(title: str, region: str) -> str:
-    sources = _watchmode_sources_cached(title, region)
-    names = []
-    for s in sources:
-        nm = s.get("name") or s.get("source")
-        if nm:
-            names.append(nm)
-    names = list(dict.fromkeys(names))[:6]
-    return ", ".join(names)
+def _prefetch_availability(titles: List[str], region: str) -> Dict[str, str]:
+    """Resolve availability for a page's titles concurrently.
+
+    Each title costs up to two Watchmode calls; _WATCHMODE_GATE paces the
+    actual API hits, so fanning out overlaps the network wait of one title
+    with the gate wait of the next instead of paying latency plus pacing
+    per title in sequence. Returns title -> formatted platform list.
+    """
+    if not _WATCHMODE_ENABLED or not titles:
+        return {}
+    futures = {
+        title: _POOL.submit(_availability_text, title, region)
+        for title in dict.fromkeys(titles)
+    }
+    return {title: f.result() for title, f in futures.items()}
 
 
 def _trailer_cached(tmdb_id: int, media_type: str) -> Optional[str]:
     key = (tmdb_id, media_type)
     if key in _TRAILER_CACHE:
         return _TRAILER_CACHE[key]
+    hit = _TRAILER_DISK.get(key)
+    if hit is not _MISS:
+        _cache_put(_TRAILER_CACHE, key, hit)
+        return hit
     try:
         url = tmdb_get_trailer_url(tmdb_id, media_type)
+        _TRAILER_DISK.set(key, url)
     except Exception:
         url = None
-    _TRAILER_CACHE[key] = url
+    _cache_put(_TRAILER_CACHE, key, url)
     return url
 
 
-def _score_100(item: Dict, intent_genres: List[int], intent_lang: Optional[str], similar_bonus: float = 0.0) -> int:
+def _score_100(item: Dict, intent_genres: FrozenSet[int], intent_lang: Optional[str], similar_bonus: float = 0.0) -> int:
+    # intent_genres is built once per request by the caller; rebuilding the
+    # set here would cost a fresh allocation for every candidate scored.
     rating = _rating(item)  # 0..10
     pop = _popularity(item)  # 0..big
 
-    item_genres = item.get("genre_ids") or []
     if intent_genres:
-        overlap = len(set(item_genres).intersection(set(intent_genres))) / max(len(set(intent_genres)), 1)
+        overlap = len(intent_genres.intersection(item.get("genre_ids") or ())) / len(intent_genres)
     else:
         overlap = 0.35
 
@@ -266,15 +445,16 @@ def _in_year_range(item: Dict, year_from: Optional[int], year_to: Optional[int])
 
 
 def _dedupe_by_id(items: List[Dict]) -> List[Dict]:
-    seen = set()
-    out = []
+    # Insertion-ordered dict instead of a seen-set plus output list: one
+    # structure, one membership probe per item. setdefault keeps the FIRST
+    # occurrence — the title route pins the matched seed at index 0, so a
+    # last-wins comprehension would unpin it.
+    by_id: Dict[int, Dict] = {}
     for x in items:
         xid = x.get("id")
-        if not xid or xid in seen:
-            continue
-        seen.add(xid)
-        out.append(x)
-    return out
+        if xid:
+            by_id.setdefault(xid, x)
+    return list(by_id.values())
 
 def recommend_ai(
     user_text: str,
@@ -284,6 +464,14 @@ def recommend_ai(
     page_size: int = 10,
     sort_by: Optional[str] = None,
 ) -> Dict:
+    # 0) Whole-response cache: every argument participates in the key, so a
+    #    hit is exactly the same request asked again within the TTL.
+    cache_key = (user_text, content_type, language, page, page_size, sort_by)
+    now = time.time()
+    cached = _RESULT_CACHE.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+
     # 1) Parse the query with the local intent engine (see ai_intent.py)
     h = parse_intent(user_text)
 
@@ -356,20 +544,31 @@ def recommend_ai(
                 # credits where they actually played a significant part.
                 pool = [x for x in cast if _is_real_role(x)]
 
+            # One pass over the filmography instead of a list rebuild per
+            # filter — prolific credits run to hundreds of entries.
             wanted_media = "movie" if ct == "movie" else "tv"
-            pool = [x for x in pool if x.get("media_type") == wanted_media]
-            if lang:
-                pool = [x for x in pool if x.get("original_language") == lang]
-            if year_from or year_to:
+            genre_set = frozenset(genre_ids)
+            exclude_set = frozenset(exclude_ids)
+            check_years = bool(year_from or year_to)
+
+            def _keep(x: Dict) -> bool:
+                if x.get("media_type") != wanted_media:
+                    return False
+                if lang and x.get("original_language") != lang:
+                    return False
                 # Credits carry their own dates; discover-style year params
                 # don't apply on this route, so filter the pool directly.
-                pool = [x for x in pool if _in_year_range(x, year_from, year_to)]
-            if genre_ids:
-                pool = [x for x in pool if set(x.get("genre_ids") or []) & set(genre_ids)]
-            if exclude_ids:
-                pool = [x for x in pool if not (set(x.get("genre_ids") or []) & set(exclude_ids))]
-
-            candidates = _rank_person_credits(pool, effective_sort)
+                if check_years and not _in_year_range(x, year_from, year_to):
+                    return False
+                if genre_set or exclude_set:
+                    item_genres = frozenset(x.get("genre_ids") or ())
+                    if genre_set and not (item_genres & genre_set):
+                        return False
+                    if exclude_set and (item_genres & exclude_set):
+                        return False
+                return True
+
+            candidates = _rank_person_credits([x for x in pool if _keep(x)], effective_sort)
 
     # 4) TITLE ROUTE: an exact title, or "like <title>"
     if not candidates and title_query:
@@ -395,11 +594,18 @@ def recommend_ai(
 
     # 5) DISCOVER ROUTE: structured filters straight from the engine
     if not candidates:
+        # Each keyword term needs its own TMDB lookup; the lookups are
+        # independent, so overlap them instead of paying one RTT per term.
         keyword_ids: List[int] = []
-        for term in h.keywords[:2]:
-            kw = (_safe_call(tmdb_search_keyword, term, page=1) or {}).get("results", [])
-            if kw and kw[0].get("id"):
-                keyword_ids.append(kw[0]["id"])
+        kw_terms = h.keywords[:2]
+        if kw_terms:
+            lookups = _POOL.map(
+                lambda term: (_safe_call(tmdb_search_keyword, term, page=1) or {}).get("results", []),
+                kw_terms,
+            )
+            for kw in lookups:
+                if kw and kw[0].get("id"):
+                    keyword_ids.append(kw[0]["id"])
 
         shared = dict(
             page=tmdb_page,
@@ -445,32 +651,54 @@ def recommend_ai(
 
     candidates = _dedupe_by_id(candidates)
 
-    # 6) Build page results: scoring, trailer lookup, availability lookup
-    items: List[Dict] = []
-    trailer_calls = 0
-    avail_calls = 0
+    if not effective_sort:
+        # Without an explicit sort the final page is ranked by match score,
+        # but the page (and its trailer/availability budget) used to be
+        # carved off the front of whatever order the provider returned —
+        # the best-scoring items could miss enrichment entirely. Scoring is
+        # local arithmetic, so pre-rank the whole pool the same way the
+        # page will be ranked. The exact-match key keeps the seed pinned.
+        rank_genres = frozenset(genre_ids)
+        rank_bonus = 0.06 if title_query else 0.0
+        candidates.sort(
+            key=lambda c: (c.get("id") != seed_id, -_score_100(c, rank_genres, lang, rank_bonus))
+        )
 
+    # 6) Build page results: scoring, trailer lookup, availability lookup.
+    #    Pick the page's items first, then fetch their trailers and
+    #    availability concurrently: the lookups are independent of each
+    #    other, so the page costs roughly one round trip instead of a
+    #    round trip per lookup; _WATCHMODE_GATE paces the Watchmode hits.
+    page_items: List[Tuple[int, str, Dict]] = []
     for c in candidates:
         tmdb_id = c.get("id")
         if not tmdb_id:
             continue
-
         title = c.get("title") if media_type == "movie" else c.get("name")
         if not title:
             continue
+        page_items.append((tmdb_id, title, c))
+        if len(page_items) >= page_size:
+            break
 
-        trailer = None
-        if trailer_calls < TRAILER_LOOKUPS_PER_REQUEST:
-            trailer = _trailer_cached(tmdb_id, media_type)
-            trailer_calls += 1
+    trailer_futures = {
+        tmdb_id: _POOL.submit(_trailer_cached, tmdb_id, media_type)
+        for tmdb_id, _title, _c in page_items[:TRAILER_LOOKUPS_PER_REQUEST]
+    }
 
-        availability = ""
-        if avail_calls < AVAILABILITY_LOOKUPS_PER_REQUEST:
-            availability = _availability_text(title, DEFAULT_REGION)
-            avail_calls += 1
-            time.sleep(WATCHMODE_SLEEP_BETWEEN_CALLS)
+    availability_by_title = _prefetch_availability(
+        [title for _id, title, _c in page_items[:AVAILABILITY_LOOKUPS_PER_REQUEST]],
+        DEFAULT_REGION,
+    )
+    genre_set = frozenset(genre_ids)
+    similar_bonus = 0.06 if title_query else 0.0
+    items: List[Dict] = []
+    for tmdb_id, title, c in page_items:
+        future = trailer_futures.get(tmdb_id)
+        trailer = future.result() if future else None
+        availability = availability_by_title.get(title, "")
 
-        score = _score_100(c, genre_ids, lang, similar_bonus=0.06 if title_query else 0.0)
+        score = _score_100(c, genre_set, lang, similar_bonus=similar_bonus)
 
         items.append({
             "type": "movie" if media_type == "movie" else "series",
@@ -490,9 +718,6 @@ def recommend_ai(
             "score": score,
         })
 
-        if len(items) >= page_size:
-            break
-
     if effective_sort:
         # A sort was explicitly requested, so the upstream ordering is the
         # answer. Re-ranking by match score here would silently undo it —
@@ -503,7 +728,7 @@ def recommend_ai(
         # No explicit sort: rank by how well each title fits the request.
         items.sort(key=lambda x: (not x.get("is_exact_match"), -x.get("score", 0)))
 
-    return {
+    response = {
         "items": items,
         "page": tmdb_page,
         "page_size": page_size,
@@ -530,3 +755,62 @@ def recommend_ai(
             "matched_terms": [{"kind": k, "term": v} for k, v in h.matched_terms],
         },
     }
+
+    # Empty pages are not cached: with the step-6 fallback search a healthy
+    # pipeline almost never returns zero items, so an empty result usually
+    # means every provider call failed — and transient failures must never
+    # outlive the request (the disk caches follow the same rule).
+    if items:
+        if len(_RESULT_CACHE) >= _RESULT_CACHE_MAX:
+            _RESULT_CACHE.clear()
+        _RESULT_CACHE[cache_key] = (now + _RESULT_CACHE_TTL, response)
+    return response
+
+
+def recommend_ai_bulk(
+    user_text: str,
+    content_type: Optional[str] = None,
+    language: Optional[str] = None,
+    pages: int = 2,
+    page_size: int = 10,
+    sort_by: Optional[str] = None,
+) -> Dict:
+    """Fetch and merge several result pages in one call.
+
+    "Load more" clients re-send the same prompt once per page, paying a
+    full request round trip each time. Here pages 1..N run concurrently —
+    parse_intent's cache means the prompt is parsed once, and the provider
+    response cache dedupes any shared upstream calls — and the merged list
+    is deduped by tmdb_id, since adjacent TMDB pages can overlap at the
+    boundaries. The intent echo comes from page 1.
+    """
+    pages = max(1, min(int(pages), 3))
+    futures = [
+        _PAGE_POOL.submit(
+            recommend_ai,
+            user_text=user_text,
+            content_type=content_type,
+            language=language,
+            page=p,
+            page_size=page_size,
+            sort_by=sort_by,
+        )
+        for p in range(1, pages + 1)
+    ]
+    results = [f.result() for f in futures]
+
+    seen = set()
+    items: List[Dict] = []
+    for res in results:
+        for item in res["items"]:
+            if item["tmdb_id"] in seen:
+                continue
+            seen.add(item["tmdb_id"])
+            items.append(item)
+
+    return {
+        "items": items,
+        "pages": pages,
+        "page_size": page_size,
+        "intent": results[0]["intent"],
+    }
@@ -1,8 +1,17 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
 import streamlit as st
 
+# Background worker that warms the next page while the user reads this one.
+# Streamlit re-executes this script on every interaction, so the executor is
+# created through st.cache_resource — the one-per-process singleton — rather
+# than spawning a fresh pool (and leaking its thread) on each rerun.
+@st.cache_resource
+def _prefetcher() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=1, thread_name_prefix="mc-prefetch")
+
 API_URL = os.getenv("MOVIECHAT_API_URL", "https://moviechatai-backend.onrender.com").rstrip("/")
 
 st.set_page_config(page_title="MovieChat AI", page_icon="🎬", layout="wide")
@@ -176,6 +185,7 @@ _DEFAULTS = {
     "last_language": None,
     "intent": {},
     "error": None,
+    "prefetch": None,  # (payload key, Future) for the next page, if warming
 }
 for _key, _val in _DEFAULTS.items():
     st.session_state.setdefault(_key, _val)
@@ -231,19 +241,42 @@ text = st.text_input("What do you want to watch?", value="hindi comedy movies re
 col_search, col_more, col_clear = st.columns([1, 1, 1])
 
 
-def fetch(page: int) -> dict:
-    payload = {
+def _payload(page: int) -> dict:
+    return {
         "text": text,
         "page": page,
         "page_size": page_size,
         "content_type": content_type,
         "language": language,
     }
+
+
+def _post_ai(payload: dict) -> dict:
+    # Runs on the prefetch thread too, so it only touches its arguments —
+    # never session_state or widget values.
     r = requests.post(f"{API_URL}/ai", json=payload, timeout=90)
     r.raise_for_status()
     return r.json()
 
 
+def _prefetch_key(payload: dict) -> tuple:
+    return tuple(sorted(payload.items(), key=lambda kv: kv[0]))
+
+
+def fetch(page: int) -> dict:
+    payload = _payload(page)
+    warmed = st.session_state.prefetch
+    if warmed and warmed[0] == _prefetch_key(payload):
+        # "Load more" for exactly this page was already fired in the
+        # background; resolving the future costs only the remaining wait.
+        st.session_state.prefetch = None
+        return warmed[1].result()
+    # A stale prefetch (query or filters changed since) simply never matches
+    # and is dropped here.
+    st.session_state.prefetch = None
+    return _post_ai(payload)
+
+
 def run_search(reset: bool) -> None:
     if not text.strip():
         st.session_state.error = "Please enter what you'd like to watch."
@@ -275,6 +308,11 @@ def run_search(reset: bool) -> None:
     st.session_state.results.extend(data.get("items", []))
     st.session_state.intent = data.get("intent", {})
 
+    # Warm the next page while the user reads this one, so the next
+    # "Load more" resolves an already-finished request.
+    nxt = _payload(st.session_state.page + 1)
+    st.session_state.prefetch = (_prefetch_key(nxt), _prefetcher().submit(_post_ai, nxt))
+
 
 filters_changed = (
     st.session_state.last_query != text